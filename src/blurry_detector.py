@@ -1,7 +1,36 @@
 #!/usr/bin/env python3
+import os
 import cv2
+import hashlib
+import pickle
 import shutil
 from pathlib import Path
+from typing import Iterator
+from concurrent.futures import ProcessPoolExecutor
+
+# Bytes read from each end of a file to build its blur cache signature
+SIGNATURE_BYTES = 4096
+
+# Bump whenever `blur_variance` changes so stale on-disk caches are ignored
+BLUR_CACHE_VERSION = 2
+
+def blur_variance(image_path: Path) -> float | None:
+    """
+    Compute the Laplacian variance of an image, the measure used by `is_blurry`.
+    Args:
+        image_path (Path): Path to the image file.
+
+    Returns:
+        float | None: Laplacian variance, or None if the file can't be read as an image.
+    """
+    img = cv2.imread(str(image_path), cv2.IMREAD_GRAYSCALE)
+    if img is None:
+        return None
+    # float32 halves the memory traffic of the (memory-bound) Laplacian, and
+    # meanStdDev computes the variance in a single pass inside OpenCV
+    lap = cv2.Laplacian(img, cv2.CV_32F)
+    _, std = cv2.meanStdDev(lap)
+    return float(std[0, 0]) ** 2
 
 def is_blurry(image_path: Path, threshold: float = 100.0) -> bool:
     """
@@ -14,13 +43,87 @@ def is_blurry(image_path: Path, threshold: float = 100.0) -> bool:
     Returns:
         bool: True if the image is blurry, False otherwise.
     """
-    img = cv2.imread(str(image_path), cv2.IMREAD_GRAYSCALE)
-    if img is None:
+    fm = blur_variance(image_path)
+    if fm is None:
         return False  # skip unreadable files
-    fm = cv2.Laplacian(img, cv2.CV_64F).var()
     return fm < threshold
 
-def collect_blurry(src_dir: Path, review_dir: Path, threshold: float = 100.0):
+# The helpers below intentionally mirror `iter_image_files`, `_hash_db_key`,
+# `load_hash_db` and `save_hash_db` in duplicate_finder/duplicate_finder.py: both
+# scripts run standalone and don't import each other, so keep the copies in sync.
+
+def iter_image_files(src_dir: Path, extensions=None) -> Iterator[Path]:
+    """
+    Lazily walk the given directory and yield image file paths matching allowed extensions.
+    Uses `os.scandir`, so directory entries come with their file type and the cheap
+    suffix check runs before any stat call.
+
+    Args:
+        src_dir (Path): Directory to scan for image files.
+        extensions (set of str, optional): File extensions to include (with leading dot).
+            Defaults to common image types (.png, .jpg, etc.).
+
+    Yields:
+        Path: Image file paths.
+    """
+    if extensions is None:
+        extensions = {'.png', '.jpg', '.jpeg', '.bmp', '.gif', '.webp'}
+    stack = [src_dir]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif os.path.splitext(entry.name)[1].lower() in extensions and entry.is_file():
+                    yield Path(entry.path)
+
+def _blur_cache_key(image_path: Path) -> bytes:
+    """
+    Build the blur cache key for a file: a SHA-1 over its size and its first and last
+    `SIGNATURE_BYTES`, so repeated files hit the cache without being decoded.
+    Raises OSError if the file can't be opened.
+    """
+    with open(image_path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        head = f.read(SIGNATURE_BYTES)
+        f.seek(max(size - SIGNATURE_BYTES, 0))
+        tail = f.read(SIGNATURE_BYTES)
+    return hashlib.sha1(size.to_bytes(8, "little") + head + tail).digest()[:8]
+
+def load_blur_cache(cache_path: Path) -> dict[bytes, float | None]:
+    """
+    Load a previously saved blur cache from disk.
+
+    Args:
+        cache_path (Path): Path to the pickled blur cache.
+
+    Returns:
+        dict[bytes, float | None]: Mapping of content signature to the Laplacian variance.
+            Empty if the file is missing, unreadable or was written by another blur version.
+    """
+    try:
+        with open(cache_path, "rb") as f:
+            cache = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        return {}
+    if not isinstance(cache, dict) or cache.get("version") != BLUR_CACHE_VERSION:
+        return {}
+    return cache["variances"]
+
+def save_blur_cache(cache_path: Path, cache: dict[bytes, float | None]) -> None:
+    """
+    Atomically write the blur cache to disk.
+
+    Args:
+        cache_path (Path): Path to the pickled blur cache.
+        cache (dict[bytes, float | None]): Mapping of content signature to the Laplacian variance.
+    """
+    tmp_path = cache_path.with_name(cache_path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        pickle.dump({"version": BLUR_CACHE_VERSION, "variances": cache}, f, protocol=5)
+    os.replace(tmp_path, cache_path)
+
+def collect_blurry(src_dir: Path, review_dir: Path, threshold: float = 100.0, cache_path: Path | None = None):
     """
     Collects blurry images from the source directory and copies them to the review directory.
 
@@ -28,6 +131,8 @@ def collect_blurry(src_dir: Path, review_dir: Path, threshold: float = 100.0):
         src_dir (Path): Source directory containing images to check.
         review_dir (Path): Directory where flagged blurry images will be copied.
         threshold: float: Variance threshold for blurriness detection. Higher values mean stricter detection (more images flagged).
+        cache_path (Path, optional): Blur cache file. Images whose content signature was seen
+            before (in this or an earlier run) reuse the stored variance instead of being decoded.
 
     Returns:
 
@@ -35,21 +140,48 @@ def collect_blurry(src_dir: Path, review_dir: Path, threshold: float = 100.0):
     review_dir.mkdir(parents=True, exist_ok=True)
 
     exts = {'.png', '.jpg', '.jpeg', '.bmp', '.gif', '.webp'}
-    for img_path in src_dir.rglob("*"):
-        if img_path.suffix.lower() not in exts:
-            continue
-        # Skip files already in the review_dir
-        if review_dir in img_path.parents:
-            continue
-        if is_blurry(img_path, threshold):
+    # Skip files already in the review_dir. Both sides are resolved once so a plain
+    # string prefix test replaces walking every candidate's parents.
+    review_prefix = str(review_dir.resolve()) + os.sep
+    candidates = (
+        img_path for img_path in iter_image_files(src_dir.resolve(), exts)
+        if not str(img_path).startswith(review_prefix)
+    )
+
+    cache = load_blur_cache(cache_path) if cache_path is not None else {}
+    signatures = {}
+    for img_path in candidates:
+        try:
+            signatures[img_path] = _blur_cache_key(img_path)
+        except OSError:
+            continue  # skip unreadable files
+    # Only one image per unseen signature needs to be decoded
+    todo = {}
+    for img_path, sig in signatures.items():
+        if sig not in cache:
+            todo.setdefault(sig, img_path)
+
+    # Blur detection is independent per image, so fan it out over all cores.
+    # Renaming stays in the parent process once the results come back.
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        for sig, fm in zip(todo, executor.map(blur_variance, todo.values(), chunksize=32)):
+            cache[sig] = fm
+
+    for img_path, sig in signatures.items():
+        fm = cache[sig]
+        if fm is not None and fm < threshold:
             img_path.rename(review_dir / img_path.name)
             print(f"-> Flagged blurry: {img_path.name}")
 
+    if cache_path is not None:
+        save_blur_cache(cache_path, {sig: cache[sig] for sig in signatures.values()})
+
 if __name__ == "__main__":
     SRC        = Path(__file__).parent.parent / "data" / "raw" / "restaurant_images" / "non_food"
     REVIEW_DIR = SRC / "blurry_review"
     THRESHOLD  = 5.0   # tweak: higher → stricter (more images flagged)
+    CACHE      = SRC / ".blur_cache.pkl"   # Laplacian variances reused across runs
 
     print(f"Scanning {SRC} for blur (threshold={THRESHOLD})…")
-    collect_blurry(SRC, REVIEW_DIR, THRESHOLD)
+    collect_blurry(SRC, REVIEW_DIR, THRESHOLD, CACHE)
     print(f"Done. Blurry images copied to: {REVIEW_DIR}")
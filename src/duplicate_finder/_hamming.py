@@ -0,0 +1,69 @@
+"""
+_hamming.py
+
+Numba-compiled Hamming distance grouping for 64-bit perceptual hashes.
+Importing this module fails with ImportError when Numba is not installed;
+callers fall back to the numpy implementation in that case.
+"""
+
+import numpy as np
+from numba import njit
+
+# SWAR popcount masks; kept as uint64 so Numba never promotes to float
+_M1 = np.uint64(0x5555555555555555)
+_M2 = np.uint64(0x3333333333333333)
+_M4 = np.uint64(0x0F0F0F0F0F0F0F0F)
+_H01 = np.uint64(0x0101010101010101)
+
+
+@njit(cache=True, inline="always")
+def _popcount(x):
+    x = x - ((x >> np.uint64(1)) & _M1)
+    x = (x & _M2) + ((x >> np.uint64(2)) & _M2)
+    x = (x + (x >> np.uint64(4))) & _M4
+    return np.int32((x * _H01) >> np.uint64(56))
+
+
+@njit(cache=True)
+def _find(parent, i):
+    # Path halving keeps the trees flat
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+
+@njit(cache=True)
+def group(hashes, threshold):
+    """
+    Union all pairs of hashes within `threshold` Hamming distance.
+
+    Args:
+        hashes (np.ndarray): Contiguous uint64 array of hashes.
+        threshold (int): Maximum Hamming distance to consider two hashes similar.
+
+    Returns:
+        np.ndarray: int32 array with the root index of each hash's group.
+    """
+    n = hashes.shape[0]
+
+    # Union each match as soon as it is found, so memory stays O(n) even for buckets
+    # where nearly every pair matches (e.g. many copies sharing one hash). The parent
+    # array isn't safe to share across threads, so the scan runs serially.
+    parent = np.arange(n, dtype=np.int32)
+    for i in range(n):
+        h = hashes[i]
+        root_i = _find(parent, i)
+        for j in range(i + 1, n):
+            if _popcount(h ^ hashes[j]) <= threshold:
+                root_j = _find(parent, j)
+                if root_i != root_j:
+                    # Link the larger root under the smaller one; root_i stays current
+                    if root_i < root_j:
+                        parent[root_j] = root_i
+                    else:
+                        parent[root_i] = root_j
+                        root_i = root_j
+    for i in range(n):
+        parent[i] = _find(parent, i)
+    return parent
@@ -0,0 +1,48 @@
+"""
+_phash.py
+
+Numba-compiled pHash kernel: 8x8 low-frequency DCT block, median threshold and bit
+packing of a decoded 32x32 grayscale image, run without holding the GIL.
+Importing this module fails with ImportError when Numba is not installed;
+callers fall back to the numpy implementation in that case.
+"""
+
+import numpy as np
+from numba import njit
+
+
+@njit(nogil=True, cache=True)
+def phash(pixels, basis):
+    """
+    Hash a 32x32 grayscale image from the first rows of its DCT basis.
+
+    Args:
+        pixels (np.ndarray): Contiguous (n, n) float32 array of grayscale pixels.
+        basis (np.ndarray): (k, n) float32 rows of the orthonormal DCT-II matrix.
+
+    Returns:
+        np.uint64: The k*k-bit hash, first coefficient in the highest bit, matching
+            `np.packbits` of the row-major block.
+    """
+    k, n = basis.shape
+
+    # low = basis @ pixels @ basis.T, as plain loops so no BLAS call is needed
+    rows = np.zeros((k, n), dtype=np.float32)
+    for u in range(k):
+        for y in range(n):
+            b = basis[u, y]
+            for x in range(n):
+                rows[u, x] += b * pixels[y, x]
+    low = np.zeros(k * k, dtype=np.float32)
+    for u in range(k):
+        for v in range(k):
+            acc = np.float32(0.0)
+            for x in range(n):
+                acc += rows[u, x] * basis[v, x]
+            low[u * k + v] = acc
+
+    median = np.median(low)
+    h = np.uint64(0)
+    for i in range(k * k):
+        h = (h << np.uint64(1)) | np.uint64(low[i] > median)
+    return h
@@ -6,12 +6,94 @@ Detects visually similar images in a directory by computing perceptual hashes,
 organizes potential duplicates into subfolders for manual review.
 """
 
+import mmap
+import os
+import pickle
+import random
 import shutil
+import uuid
 from pathlib import Path
-from PIL import Image
-import imagehash
-from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator
+import numpy as np
+import pyvips
+import xxhash
+from PIL import Image, UnidentifiedImageError
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import get_context
+from multiprocessing.pool import ThreadPool
 from collections import defaultdict
+from tqdm import tqdm
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None  # Not POSIX: no reflinks, fast_copy falls back to a regular copy
+
+# ioctl request to clone a file's extents (Linux FICLONE; exposed by fcntl only on 3.12+)
+_FICLONE = getattr(fcntl, "FICLONE", 0x40049409)
+
+try:
+    # Compiled grouping kernel; falls back to the numpy path below without Numba
+    from _hamming import group as _group_kernel
+except ImportError:
+    _group_kernel = None
+
+try:
+    # Compiled pHash kernel that runs without the GIL; falls back to numpy without Numba
+    from _phash import phash as _phash_kernel
+except ImportError:
+    _phash_kernel = None
+
+# Bump whenever `compute_hash` changes so stale on-disk caches are ignored.
+HASH_DB_VERSION = 3
+
+# Number of set bits for every byte value, used to popcount XOR-ed hash bytes
+_POPCOUNT8 = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(axis=1).astype(np.uint8)
+
+
+def _dct_basis(n: int, k: int) -> np.ndarray:
+    """
+    First `k` rows of the orthonormal n-point DCT-II matrix (the scaling `cv2.dct` uses),
+    so the low-frequency block of a 2D DCT is `D @ X @ D.T`.
+    """
+    freqs = np.arange(k)[:, None]
+    samples = np.arange(n)[None, :]
+    basis = np.cos(np.pi * (2 * samples + 1) * freqs / (2 * n)) * np.sqrt(2 / n)
+    basis[0] /= np.sqrt(2)
+    return basis.astype(np.float32)
+
+
+# pHash only needs the 8x8 low-frequency corner of the 32x32 DCT, so precompute
+# that slice of the basis once instead of running a full transform per image
+_DCT_8x32 = _dct_basis(32, 8)
+_DCT_8x32_T = np.ascontiguousarray(_DCT_8x32.T)
+
+
+# Mirrored in blurry_detector.py (the scripts don't import each other); keep in sync
+def iter_image_files(src_dir: Path, extensions=None) -> Iterator[Path]:
+    """
+    Lazily walk the given directory and yield image file paths matching allowed extensions.
+    Uses `os.scandir`, so directory entries come with their file type and the cheap
+    suffix check runs before any stat call.
+
+    Args:
+        src_dir (Path): Directory to scan for image files.
+        extensions (set of str, optional): File extensions to include (with leading dot).
+            Defaults to common image types (.png, .jpg, etc.).
+
+    Yields:
+        Path: Image file paths.
+    """
+    if extensions is None:
+        extensions = {'.png', '.jpg', '.jpeg', '.bmp', '.gif', '.webp'}
+    stack = [src_dir]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif os.path.splitext(entry.name)[1].lower() in extensions and entry.is_file():
+                    yield Path(entry.path)
 
 
 def find_image_files(src_dir: Path, extensions=None) -> list[Path]:
@@ -26,129 +108,464 @@ def find_image_files(src_dir: Path, extensions=None) -> list[Path]:
     Returns:
         list[Path]: List of image file paths.
     """
-    if extensions is None:
-        extensions = {'.png', '.jpg', '.jpeg', '.bmp', '.gif', '.webp'}
-    return [p for p in src_dir.rglob("*") if p.is_file() and p.suffix.lower() in extensions]
+    return list(iter_image_files(src_dir, extensions))
 
 
-def compute_hash(path: Path) -> tuple[Path, imagehash.ImageHash]:
+def _load_pixels(path: Path) -> np.ndarray | None:
     """
-    Compute a perceptual hash for the image at the given path using pHash.
+    Decode an image straight to a 32x32 grayscale float32 array.
+    libvips is tried first; formats it has no loader for (e.g. BMP) are only decoded by
+    PIL, and the resize and grayscale conversion still run in libvips, so every format
+    lands in the same hash space.
+
+    Returns:
+        np.ndarray | None: The pixels, or None if neither library can decode the file.
+    """
+    try:
+        img = pyvips.Image.thumbnail(str(path), 32, height=32, size="force")
+    except pyvips.Error:
+        try:
+            with Image.open(path) as pil_img:
+                rgb = np.asarray(pil_img.convert("RGB"))
+        except (OSError, UnidentifiedImageError):
+            return None
+        img = pyvips.Image.new_from_array(rgb, interpretation="srgb").thumbnail_image(32, height=32, size="force")
+    return img.colourspace("b-w")[0].numpy().astype(np.float32)
+
+
+def compute_hash(path: Path) -> tuple[Path, int | None]:
+    """
+    Compute a 64-bit perceptual hash (pHash) for the image at the given path.
+    libvips shrinks on load (JPEGs are decoded straight at reduced scale), so the
+    full-resolution image is never materialized, and only the 8x8 low-frequency
+    block of the 32x32 DCT is computed, as two small matrix products. With Numba the
+    DCT, median and bit packing run as one compiled kernel that releases the GIL.
+
+    Args:
+        path (Path): Path to the image file.
+
+    Returns:
+        tuple[Path, int | None]: Original path and its perceptual hash, bits in the same
+            order as `imagehash.phash`; None if the file can't be decoded.
+    """
+    pixels = _load_pixels(path)
+    if pixels is None:
+        return path, None
+    if _phash_kernel is not None:
+        return path, int(_phash_kernel(pixels, _DCT_8x32))
+    low = _DCT_8x32 @ pixels @ _DCT_8x32_T
+    bits = np.packbits(low > np.median(low))
+    return path, int.from_bytes(bits.tobytes(), "big")
+
+
+def compute_digest(path: Path) -> tuple[Path, tuple[int, int]]:
+    """
+    Compute a fast content digest of the raw file bytes, used to spot byte-identical copies.
+    The file is memory-mapped, which also warms the page cache for the decode that follows.
 
     Args:
         path (Path): Path to the image file.
 
     Returns:
-        tuple[Path, imagehash.ImageHash]: Original path and its perceptual hash.
+        tuple[Path, tuple[int, int]]: Original path and its (size, xxh3-64 digest).
     """
-    with Image.open(path) as img:
-        return path, imagehash.phash(img)
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            # Empty files can't be memory-mapped
+            return path, (0, xxhash.xxh3_64_intdigest(b""))
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return path, (size, xxhash.xxh3_64_intdigest(mm))
 
 
-def compute_hashes(paths: list[Path], use_processes: bool = True) -> dict[Path, imagehash.ImageHash]:
+def _init_worker() -> None:
+    """
+    Process pool initializer: every image goes to exactly one worker process, so keep
+    libvips single-threaded and drop its operation cache to avoid oversubscription.
+    This changes process-wide libvips state, so it must not run in the caller's process.
+    """
+    pyvips.concurrency_set(1)
+    pyvips.cache_set_max(0)
+
+
+# `_hash_db_key`, `load_hash_db` and `save_hash_db` are mirrored by the blur cache
+# helpers in blurry_detector.py (the scripts don't import each other); keep in sync
+def _hash_db_key(path: Path) -> tuple[str, int, int]:
+    """
+    Build the hash cache key for a file: its path plus modification time and size,
+    so any change to the file invalidates its cached hash.
+    """
+    st = path.stat()
+    return str(path), st.st_mtime_ns, st.st_size
+
+
+def load_hash_db(db_path: Path) -> dict[tuple[str, int, int], int]:
+    """
+    Load a previously saved hash cache from disk.
+
+    Args:
+        db_path (Path): Path to the pickled hash cache.
+
+    Returns:
+        dict[tuple[str, int, int], int]: Mapping of (path, mtime_ns, size) to the 64-bit hash.
+            Empty if the file is missing, unreadable or was written by another hash version.
+    """
+    try:
+        with open(db_path, "rb") as f:
+            db = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        return {}
+    if not isinstance(db, dict) or db.get("version") != HASH_DB_VERSION:
+        return {}
+    return db["hashes"]
+
+
+def save_hash_db(db_path: Path, hashes: dict[tuple[str, int, int], int]) -> None:
+    """
+    Atomically write the hash cache to disk.
+
+    Args:
+        db_path (Path): Path to the pickled hash cache.
+        hashes (dict[tuple[str, int, int], int]): Mapping of (path, mtime_ns, size) to the 64-bit hash.
+    """
+    tmp_path = db_path.with_name(db_path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        pickle.dump({"version": HASH_DB_VERSION, "hashes": hashes}, f, protocol=5)
+    os.replace(tmp_path, db_path)
+
+
+def compute_hashes(paths: list[Path], use_processes: bool = True, hash_db: Path | None = None) -> tuple[np.ndarray, np.ndarray]:
     """
     Compute perceptual hashes for all images in the provided paths.
 
     Args:
         paths (list[Path]): List of image file paths.
-        use_processes (bool): Whether to parallelize via processes.
+        use_processes (bool): Whether to parallelize via processes instead of threads.
+            Threads skip the pickle round-trip; libvips decodes and the compiled pHash
+            kernel release the GIL, but pyvips' Python-side call overhead still holds it.
+        hash_db (Path, optional): Hash cache file. Images whose path, mtime and size match
+            a cached entry are not re-hashed; the cache is rewritten after the run.
 
     Returns:
-        dict[Path, imagehash.ImageHash]: Mapping of file paths to their hashes.
+        tuple[np.ndarray, np.ndarray]: Object array of file paths and the uint64 array of
+            their hashes, both in input order. Files that can't be decoded are reported
+            and left out.
     """
+    db = load_hash_db(hash_db) if hash_db is not None else {}
+    keys = {path: _hash_db_key(path) for path in paths}
+
     hashes = {}
-    # Use process pool for CPU-bound hashing
-    with ProcessPoolExecutor() as executor:
-        for path, h in executor.map(compute_hash, paths):
-            hashes[path] = h
-    return hashes
+    stale = []
+    unreadable = []
+    for path in paths:
+        cached = db.get(keys[path])
+        if cached is None:
+            stale.append(path)
+        else:
+            hashes[path] = cached
+
+    if stale:
+        # Workers get batches of images and results stream back as they finish;
+        # shuffling spreads large images evenly.
+        workers = os.cpu_count() or 1
+        chunksize = max(16, len(stale) // (workers * 4))
+        if use_processes:
+            # Spawn rather than fork: forking after libvips has started its threads deadlocks.
+            # The initializer tunes libvips process-wide, so it only runs inside workers.
+            pool = get_context("spawn").Pool(processes=workers, initializer=_init_worker)
+        else:
+            pool = ThreadPool(processes=workers)
+        with pool:
+            # Byte-identical files only need to be decoded and pHashed once
+            copies = defaultdict(list)
+            results = pool.imap_unordered(compute_digest, stale, chunksize=chunksize)
+            for path, digest in tqdm(results, total=len(stale), desc="Digesting", unit="img"):
+                copies[digest].append(path)
+            originals = {same[0]: same for same in copies.values()}
+
+            results = pool.imap_unordered(compute_hash, random.sample(list(originals), len(originals)), chunksize=chunksize)
+            for path, h in tqdm(results, total=len(originals), desc="Hashing", unit="img"):
+                if h is None:
+                    unreadable.extend(originals[path])
+                    continue
+                for same in originals[path]:
+                    hashes[same] = h
+
+    if unreadable:
+        print(f"Skipped {len(unreadable)} unreadable images:")
+        for path in unreadable:
+            print(f"  {path}")
+
+    if hash_db is not None:
+        # Only keep entries for the current files so the cache doesn't grow forever
+        save_hash_db(hash_db, {keys[path]: h for path, h in hashes.items()})
+    # Results arrive out of order; restore input order so grouping is deterministic
+    hashed = [path for path in paths if path in hashes]
+    paths_arr = np.empty(len(hashed), dtype=object)
+    paths_arr[:] = hashed
+    hashes_arr = np.fromiter((hashes[path] for path in hashed), dtype=np.uint64, count=len(hashed))
+    return paths_arr, hashes_arr
+
+
+def _split_buckets(keys: np.ndarray) -> list[np.ndarray]:
+    """
+    Sort the bucket keys once and cut them into runs of equal keys.
 
+    Args:
+        keys (np.ndarray): Bucket key of every hash.
 
-def bucket_hashes(hashes: dict[Path, imagehash.ImageHash], prefix_bits: int) -> dict[int, list[tuple[Path, imagehash.ImageHash]]]:
+    Returns:
+        list[np.ndarray]: Index arrays of the buckets. Buckets with a single image are
+            dropped since they cannot contain duplicates.
+    """
+    order = np.argsort(keys, kind="stable")
+    boundaries = np.flatnonzero(np.diff(keys[order]) != 0) + 1
+    return [bucket for bucket in np.split(order, boundaries) if len(bucket) > 1]
+
+
+def bucket_hashes(hashes: np.ndarray, prefix_bits: int) -> list[np.ndarray]:
     """
     Group images by the top `prefix_bits` of their hash to reduce comparisons.
 
     Args:
-        hashes (dict[Path, imagehash.ImageHash]): Mapping of paths to hashes.
+        hashes (np.ndarray): uint64 array of hashes.
         prefix_bits (int): Number of highest-order bits to use as bucket key.
 
     Returns:
-        dict[int, list[tuple[Path, imagehash.ImageHash]]]: Buckets of similar-prefix hashes.
+        list[np.ndarray]: Buckets of similar-prefix hashes, as index arrays into `hashes`.
+    """
+    keys = hashes >> np.uint64(64 - prefix_bits) # Use top `prefix_bits` of hash
+    return _split_buckets(keys)
+
+
+def multi_index_bucket(hashes: np.ndarray, chunks: int = 4, prefix_bits: int | None = 12) -> list[list[np.ndarray]]:
+    """
+    Multi-index hashing: split every hash into `chunks` equal bit chunks and bucket it
+    once per chunk table, keyed by the exact chunk value. Two hashes become candidates
+    if they share any chunk. The `bucket_hashes` prefix table is added as one more table,
+    so the candidates are always a superset of what prefix bucketing alone finds.
+    See Norouzi et al., "Fast Search in Hamming Space with Multi-Index Hashing".
+
+    Recall: only pairs within Hamming distance `chunks - 1` (3 with the defaults) are
+    guaranteed to be found, by pigeonhole; beyond that nothing is guaranteed. With
+    uniformly random bit flips, the share of pairs at exactly distance d that become
+    candidates (4 chunk tables + 12-bit prefix) is about 92% at d=4, 23% at d=10 and
+    0.1% at d=25 (prefix alone: 42%, 10% and 0.1%). Thresholds well above ~10 mostly
+    rely on near-duplicates sharing far more bits than random flips would.
+
+    Only use the chunk tables with small thresholds (~10, as in the GUI). Two unrelated
+    hashes sharing a 16-bit chunk are within distance t on the other 48 bits with
+    probability 3e-5 at t=10 but 67% at t=25, and the groups are merged transitively
+    across tables: on 20,000 random hashes at t=25 this yields one group of 17,073
+    images, against at most 14 per group with `bucket_hashes(hashes, 12)`.
+
+    Args:
+        hashes (np.ndarray): uint64 array of hashes.
+        chunks (int): Number of chunk tables; must divide 64.
+        prefix_bits (int, optional): Prefix length of the extra `bucket_hashes` table;
+            None leaves it out.
+
+    Returns:
+        list[list[np.ndarray]]: One bucket table per chunk, highest-order chunk first,
+            followed by the prefix table.
     """
-    buckets = defaultdict(list)
-    for path, h in hashes.items():
-        # Convert hex-string hash to integer
-        h_int = int(str(h), 16)
-        key = h_int >> (64 - prefix_bits) # Use top `prefix_bits` of hash
-        buckets[key].append((path, h))
-    return buckets
+    chunk_bits = 64 // chunks
+    mask = np.uint64((1 << chunk_bits) - 1)
+    tables = [
+        _split_buckets((hashes >> np.uint64(64 - (c + 1) * chunk_bits)) & mask)
+        for c in range(chunks)
+    ]
+    if prefix_bits is not None:
+        tables.append(bucket_hashes(hashes, prefix_bits))
+    return tables
+
+
+def _union_find(n: int, pairs: np.ndarray) -> np.ndarray:
+    """
+    Merge the given index pairs into disjoint sets.
 
+    Args:
+        n (int): Number of elements.
+        pairs (np.ndarray): (k, 2) array of index pairs that belong to the same set.
+
+    Returns:
+        np.ndarray: Root index of each element's set.
+    """
+    parent = np.arange(n)
+    rank = np.zeros(n, dtype=np.int8)
+
+    def find(i):
+        # Path halving keeps the trees flat
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for i, j in pairs:
+        root_i, root_j = find(i), find(j)
+        if root_i == root_j:
+            continue
+        if rank[root_i] < rank[root_j]:
+            root_i, root_j = root_j, root_i
+        parent[root_j] = root_i
+        if rank[root_i] == rank[root_j]:
+            rank[root_i] += 1
+    return np.array([find(i) for i in range(n)], dtype=np.intp)
 
-def group_similar_in_bucket(bucket_items: list[tuple[Path, imagehash.ImageHash]], threshold: int) -> list[list[Path]]:
+
+def _groups_from_labels(paths: np.ndarray, labels: np.ndarray) -> list[list[Path]]:
+    """
+    Collect paths sharing a label into groups, dropping singletons.
+
+    Args:
+        paths (np.ndarray): Object array of paths in the same order as `labels`.
+        labels (np.ndarray): Set label of each path.
+
+    Returns:
+        list[list[Path]]: Groups with more than one path, ordered by their first member.
+    """
+    order = np.argsort(labels, kind="stable")
+    boundaries = np.flatnonzero(np.diff(labels[order]) != 0) + 1
+    members = [idx for idx in np.split(order, boundaries) if len(idx) > 1]
+    members.sort(key=lambda idx: idx[0])
+    return [paths[idx].tolist() for idx in members]
+
+
+def group_similar_in_bucket(bucket_hashes: np.ndarray, threshold: int) -> np.ndarray:
 
     """
     Group similar images within a single bucket based on Hamming distance.
-    This function compares each image's hash against others in the same bucket
+    This function compares each image's hash against others in the same bucket;
+    similarity is treated as transitive, so A~B and B~C puts A, B and C in one group.
 
     Args:
-        bucket_items (list[tuple[Path, imagehash.ImageHash]]): List of (path, hash) tuples in a bucket.
+        bucket_hashes (np.ndarray): uint64 array of the hashes in a bucket.
         threshold (int): Maximum Hamming distance to consider images similar.
 
     Returns:
-        list[list[Path]]: List of groups, each containing paths of similar images.
+        np.ndarray: Group label of each hash (the index of its group's root within the bucket).
 
     """
-    groups = []
-    used = set()
-    for i, (path, h) in enumerate(bucket_items):
-        if path in used:
-            continue
-        group = [path]
-        used.add(path)
-        for other_path, other_h in bucket_items[i+1:]:
-            if other_path in used:
-                continue
-            if (h - other_h) <= threshold:
-                group.append(other_path)
-                used.add(other_path)
-        if len(group) > 1:
-            groups.append(group)
-    return groups
+    hash_arr = np.ascontiguousarray(bucket_hashes)
+    if _group_kernel is not None:
+        return _group_kernel(hash_arr, np.int32(threshold))
 
+    n = len(hash_arr)
+    # Stack the 8 hash bytes of every image into an (n, 8) matrix and build the
+    # full (n, n) Hamming distance matrix in one shot: XOR all pairs, then popcount.
+    H = hash_arr.view(np.uint8).reshape(n, 8)
+    xor = H[:, None, :] ^ H[None, :, :]
+    similar = np.triu(_POPCOUNT8[xor].sum(axis=-1) <= threshold, k=1)
+    return _union_find(n, np.argwhere(similar))
 
-def group_similar_images(buckets: dict[int, list[tuple[Path, imagehash.ImageHash]]], threshold: int) -> list[list[Path]]:
+
+def group_similar_images(paths: np.ndarray, hashes: np.ndarray, buckets: list[np.ndarray] | list[list[np.ndarray]], threshold: int) -> list[list[Path]]:
     """
     Group similar images across all buckets based on Hamming distance.
+    With several bucket tables (see `multi_index_bucket`) an image sits in one bucket
+    per table, so the per-bucket groups are merged into connected groups across tables.
 
     Args:
-        buckets (dict[int, list[tuple[Path, imagehash.ImageHash]]]): Buckets of images.
+        paths (np.ndarray): Object array of image paths.
+        hashes (np.ndarray): uint64 array of the matching hashes.
+        buckets (list[np.ndarray] | list[list[np.ndarray]]): Buckets of images as index
+            arrays (see `bucket_hashes`), or a list of such bucket tables.
         threshold (int): Maximum Hamming distance to consider images similar.
 
     Returns:
         list[list[Path]]: List of groups, each containing the paths of similar images.
 
     """
-    groups = []
-    for bucket_items in buckets.values():
-        groups.extend(group_similar_in_bucket(bucket_items, threshold))
-    return groups
+    tables = [buckets] if buckets and isinstance(buckets[0], np.ndarray) else buckets
+    pairs = []
+    for table in tables:
+        for bucket in table:
+            labels = group_similar_in_bucket(hashes[bucket], threshold)
+            # Link every image to its root, translated back to global indices
+            linked = labels != np.arange(len(bucket))
+            pairs.append(np.column_stack((bucket[labels[linked]], bucket[linked])))
+
+    pairs = np.concatenate(pairs) if pairs else np.empty((0, 2), dtype=np.intp)
+    return _groups_from_labels(paths, _union_find(len(paths), pairs))
+
+
+def _clone_or_copy(src: Path, tmp: Path) -> None:
+    """
+    Create `tmp` as a reflink (copy-on-write clone on btrfs/XFS) of `src`, or as a
+    regular copy where the filesystem can't clone. `tmp` must not exist yet.
+    """
+    cloned = False
+    with open(src, "rb") as fsrc, open(tmp, "xb") as fdst:
+        if fcntl is not None:
+            try:
+                fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+                cloned = True
+            except OSError:
+                pass  # e.g. across filesystems or unsupported by the filesystem
+    if cloned:
+        shutil.copystat(src, tmp)
+    else:
+        # `tmp` is the empty file created above, so nothing else is written through
+        shutil.copy2(src, tmp)
+
+
+def fast_copy(src: Path, dst: Path) -> None:
+    """
+    Copy a file using the cheapest mechanism available: a hard link, then a reflink
+    (copy-on-write clone on btrfs/XFS), then a regular copy.
+    Note that a hard-linked copy shares its data with the source file.
 
+    The copy is always made under a fresh temporary name and then renamed over `dst`,
+    so an existing `dst` (possibly a hard link into the dataset) is replaced, never
+    written through.
 
-def copy_groups(groups: list[list[Path]], out_dir: Path) -> None:
+    Args:
+        src (Path): File to copy.
+        dst (Path): Destination file path; replaced if it already exists.
+    """
+    tmp = dst.with_name(f".{dst.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        try:
+            os.link(src, tmp)
+        except OSError:
+            _clone_or_copy(src, tmp)
+        os.replace(tmp, dst)
+    finally:
+        # Normally gone after the rename; it survives on failure, and also when dst was
+        # already a hard link to src (rename between links to one inode is a no-op)
+        tmp.unlink(missing_ok=True)
+
+
+def copy_groups(groups: list[list[Path]], out_dir: Path, max_workers: int = 16) -> None:
     """
     Copy each group of similar images into its own subfolder under `out_dir`.
+    Copies are I/O-bound, so they are issued concurrently from a thread pool.
+    Files are named `<member index>_<original name>`, since members of a group often
+    share a basename (e.g. `253.jpg` from different dataset splits).
 
     Args:
         groups (list[list[Path]]): Groups of similar image paths.
         out_dir (Path): Base directory to create group_x folders.
+        max_workers (int): Number of copies in flight at once.
     """
     out_dir.mkdir(parents=True, exist_ok=True)
-    for idx, group in enumerate(groups, start=1):
-        grp_dir = out_dir / f"group_{idx}"
-        grp_dir.mkdir(exist_ok=True)
-        for path in group:
-            shutil.copy2(path, grp_dir)
-        print(f"Group {idx}: {len(group)} images copied to {grp_dir}")
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = []
+        for idx, group in enumerate(groups, start=1):
+            grp_dir = out_dir / f"group_{idx}"
+            grp_dir.mkdir(exist_ok=True)
+            # Unique names: two copies must never target the same destination
+            copies = [
+                executor.submit(fast_copy, path, grp_dir / f"{member}_{path.name}")
+                for member, path in enumerate(group, start=1)
+            ]
+            pending.append((idx, group, grp_dir, copies))
+
+        # Report groups in order as their copies complete; result() re-raises copy errors
+        for idx, group, grp_dir, copies in pending:
+            for copy in copies:
+                copy.result()
+            print(f"Group {idx}: {len(group)} images copied to {grp_dir}")
 
 
 def main():
@@ -158,6 +575,7 @@ def main():
     # --- Configuration ---
     SRC = Path(__file__).parent.parent.parent / "data" / "raw"
     OUT = SRC / "duplicates"
+    HASH_DB = SRC / ".phash_db.pkl"  # Cached hashes, reused while files are unchanged
     THRESHOLD = 25       # Max Hamming distance for similarity
     PREFIX_BITS = 12    # Bits to bucket hashes and reduce comparisons
 
@@ -166,13 +584,15 @@ def main():
     print(f"Found {len(image_paths)} images to process.")
 
     print("Computing perceptual hashes in parallel...")
-    hashes = compute_hashes(image_paths)
+    paths, hashes = compute_hashes(image_paths, hash_db=HASH_DB)
 
     print("Bucketing hashes to limit comparisons...")
+    # Prefix buckets, not `multi_index_bucket`: at this threshold chunk matches chain
+    # unrelated images into one huge group (see its docstring)
     buckets = bucket_hashes(hashes, PREFIX_BITS)
 
     print("Grouping similar images within each bucket...")
-    groups = group_similar_images(buckets, THRESHOLD)
+    groups = group_similar_images(paths, hashes, buckets, THRESHOLD)
     print(f"Identified {len(groups)} groups of similar images.")
 
     print(f"Copying groups to: {OUT}")
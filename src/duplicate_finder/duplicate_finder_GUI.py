@@ -6,76 +6,54 @@ Interactive GUI to review groups of similar images in-place.
 Users can click on the image to keep, then delete the rest in that group, or skip the group entirely.
 """
 
-import os
-import io
+import functools
 from pathlib import Path
 from PIL import Image, ImageTk
-import imagehash
-from concurrent.futures import ProcessPoolExecutor
-from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 import tkinter as tk
 import tkinter.messagebox
 
 # ---------- Duplicate detection pipeline functions ----------
 
-def find_image_files(src_dir: Path, extensions=None) -> list[Path]:
-    if extensions is None:
-        extensions = {'.png', '.jpg', '.jpeg', '.bmp', '.gif', '.webp'}
-    return [p for p in src_dir.iterdir() if p.is_file() and p.suffix.lower() in extensions]
-
-
-def compute_hash(path: Path) -> tuple[Path, imagehash.ImageHash]:
-    with Image.open(path) as img:
-        return path, imagehash.phash(img)
-
-
-def compute_hashes(paths: list[Path]) -> dict[Path, imagehash.ImageHash]:
-    hashes = {}
-    with ProcessPoolExecutor() as executor:
-        for path, h in executor.map(compute_hash, paths):
-            hashes[path] = h
-    return hashes
-
-
-def bucket_hashes(hashes: dict[Path, imagehash.ImageHash], prefix_bits: int) -> dict[int, list[tuple[Path, imagehash.ImageHash]]]:
-    buckets = defaultdict(list)
-    for path, h in hashes.items():
-        h_int = int(str(h), 16)
-        key = h_int >> (64 - prefix_bits)
-        buckets[key].append((path, h))
-    return buckets
-
-
-def group_similar_in_bucket(bucket_items, threshold: int) -> list[list[Path]]:
-    groups = []
-    used = set()
-    for i, (path, h) in enumerate(bucket_items):
-        if path in used:
-            continue
-        group = [path]
-        used.add(path)
-        for other_path, other_h in bucket_items[i+1:]:
-            if other_path not in used and (h - other_h) <= threshold:
-                group.append(other_path)
-                used.add(other_path)
-        if len(group) > 1:
-            groups.append(group)
-    return groups
-
-
-def group_similar_images(buckets, threshold: int) -> list[list[Path]]:
-    groups = []
-    for bucket_items in buckets.values():
-        groups.extend(group_similar_in_bucket(bucket_items, threshold))
-    return groups
+# The GUI reuses the CLI pipeline, so both find exactly the same groups
+from duplicate_finder import find_image_files, compute_hashes, multi_index_bucket, group_similar_images
 
 # ---------- Thumbnail utility ----------
 
 
-def make_thumbnail(path, size=(500,500)):
-    img = Image.open(path)
-    img.thumbnail(size)
-    return ImageTk.PhotoImage(img)
+# Decoding and resizing run here, off the Tk thread
+_thumb_pool = ThreadPoolExecutor(max_workers=4)
+
+# Submitted thumbnails by (path, size), so a group that was prefetched reuses those
+# futures instead of decoding again. Only touched from the Tk thread.
+_thumb_futures = {}
+
+
+@functools.lru_cache(maxsize=512)
+def _thumb(path_str, width, height):
+    # Only PIL work happens here so it is safe to call from the worker threads;
+    # PhotoImage objects must still be created on the Tk thread.
+    with Image.open(path_str) as img:
+        img.thumbnail((width, height), Image.Resampling.BILINEAR)
+        return img.copy()
+
+
+def submit_thumbnail(path, size=(500,500)):
+    key = (str(path), size)
+    future = _thumb_futures.get(key)
+    if future is None:
+        future = _thumb_pool.submit(_thumb, str(path), *size)
+        _thumb_futures[key] = future
+    return future
+
+
+def forget_thumbnails(keep_paths, size=(500,500)):
+    # Drop futures outside `keep_paths`; ones still queued are cancelled so they
+    # don't hold up the decodes of the visible group
+    keep = {(str(path), size) for path in keep_paths}
+    for key in list(_thumb_futures):
+        if key not in keep:
+            _thumb_futures.pop(key).cancel()
 
 def review_all(groups):
     def on_keep():
@@ -100,6 +78,23 @@ def review_all(groups):
                 p.unlink(missing_ok=True)
         next_group()
 
+    def poll_thumbnails(pending):
+        # Install finished thumbnails; widgets from a group already left are skipped
+        waiting = []
+        for future, lbl in pending:
+            if not lbl.winfo_exists():
+                continue
+            if not future.done():
+                waiting.append((future, lbl))
+            elif future.exception() is not None:
+                lbl.configure(text="Unreadable image")
+            else:
+                thumb = ImageTk.PhotoImage(future.result())
+                lbl.configure(image=thumb, text="")
+                lbl.image = thumb
+        if waiting:
+            win.after(50, poll_thumbnails, waiting)
+
     def show_group(group):
         # Clear previous widgets
         for widget in win.winfo_children():
@@ -110,14 +105,14 @@ def review_all(groups):
         tk.Label(win, text=progress).grid(row=0, column=0, columnspan=len(group), pady=(10, 0))
 
         # Thumbnails + radio buttons
+        pending = []
         for idx, path in enumerate(group):
             display_path = Path(*path.parts[-4:]) if len(path.parts) >= 4 else path
             path_lbl = tk.Label(win, text=str(display_path))
             path_lbl.grid(row=1, column=idx, padx=5, pady=(0, 2))
-            thumb = make_thumbnail(path)
-            lbl = tk.Label(win, image=thumb)
-            lbl.image = thumb
+            lbl = tk.Label(win, text="Loading…")
             lbl.grid(row=2, column=idx, padx=5, pady=5)
+            pending.append((submit_thumbnail(path), lbl))
             rb = tk.Radiobutton(win, variable=sel, value=idx, text=path.name)
             rb.grid(row=3, column=idx)
         btn_keep = tk.Button(win, text="Keep Selected", command=on_keep)
@@ -127,14 +122,20 @@ def review_all(groups):
         btn_skip.grid(row=4, column=1, pady=10)
         btn_delete_all.grid(row=4, column=2, pady=10)
         win.title(f"Review {group[0].parent.name}")
+        poll_thumbnails(pending)
 
     def next_group():
         nonlocal group_idx, current_group
         group_idx += 1
         if group_idx < len(groups) and running:
             current_group = groups[group_idx]
+            upcoming = groups[group_idx + 1] if group_idx + 1 < len(groups) else []
+            forget_thumbnails(current_group + upcoming)
             sel.set(-1)
             show_group(current_group)
+            # Decode the next group's thumbnails while this one is being reviewed
+            for path in upcoming:
+                submit_thumbnail(path)
         else:
             win.destroy()
 
@@ -154,16 +155,15 @@ def review_all(groups):
 
 if __name__ == "__main__":
     # Replace this with your grouping logic that produces `groups: list[list[Path]]`
-    from duplicate_finder import find_image_files, compute_hashes, bucket_hashes, group_similar_images
     SRC = Path(__file__).parent.parent.parent / "data" / "raw" / "restaurant_images"
     files  = find_image_files(SRC)
 
     if not files:
         raise FileNotFoundError(f"No image files found in {SRC}. Please check the directory structure.")
 
-    hashes = compute_hashes(files)
-    buckets= bucket_hashes(hashes, prefix_bits=12)
-    groups = group_similar_images(buckets, threshold=10)
+    paths, hashes = compute_hashes(files, hash_db=SRC / ".phash_db.pkl")
+    buckets= multi_index_bucket(hashes, chunks=4, prefix_bits=12)
+    groups = group_similar_images(paths, hashes, buckets, threshold=10)
 
     if not groups:
         print("No similar image groups found.")